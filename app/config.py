@@ -11,3 +11,12 @@ CELERY_RESULT_BACKEND = "redis://localhost:6379/0"
 
 CHROMA_PERSIST_DIRECTORY = "chroma_db"
 CHROMA_COLLECTION_NAME = "leis_decretos"
+
+# Chave de particionamento das coleções: "tipo_decada", "tipo", "decada" ou "none"
+CHROMA_SHARD_KEY = os.getenv("CHROMA_SHARD_KEY", "none")
+CHROMA_SHARD_MAX_WORKERS = int(os.getenv("CHROMA_SHARD_MAX_WORKERS", "8"))
+# Segundos durante os quais a lista de shards é reutilizada nas buscas
+CHROMA_SHARD_LIST_TTL = float(os.getenv("CHROMA_SHARD_LIST_TTL", "30"))
+
+# Pré-carrega langchain/ChromaDB em segundo plano ao iniciar a API e no worker Celery
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "true").lower() == "true"
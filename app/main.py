@@ -1,7 +1,10 @@
 import os
+import threading
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.config import WARMUP_ON_STARTUP
 from app.routes import api
 from app.utils.helpers import ensure_directory_exists
 
@@ -13,10 +16,27 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 if GOOGLE_API_KEY:
     os.environ["GOOGLE_API_KEY"] = GOOGLE_API_KEY
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Inicia o aquecimento dos serviços em segundo plano ao subir a API.
+
+    O servidor passa a aceitar requisições (incluindo /api/health) imediatamente,
+    enquanto langchain e ChromaDB são carregados em uma thread separada.
+    """
+    if WARMUP_ON_STARTUP:
+        from app.services.warmup import warmup_services
+
+        threading.Thread(target=warmup_services, daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title="API de Análise de Leis com LLM",
     description="Faça upload de PDFs de leis e consulte qual está em vigor.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(api.router, prefix="/api")
@@ -3,13 +3,23 @@ Este módulo está descontinuado. As funcionalidades foram refatoradas e movidas
 - app.services.document_processor
 - app.services.vector_store
 - app.services.query_service
+
+Os nomes são resolvidos sob demanda para que importar este módulo não carregue
+langchain e ChromaDB antes de serem necessários.
 """
 
-from app.services.document_processor import process_pdf_and_store
-from app.services.query_service import (
-    query_legal_document,
-    query_legal_document_self_query
-)
+import importlib
+
+# Mantendo os nomes para compatibilidade com código existente
+_LAZY_ATTRIBUTES = {
+    "process_pdf_and_store": "app.services.document_processor",
+    "query_legal_document_self_query": "app.services.query_service",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
 
-# Mantendo os imports para compatibilidade com código existente
-__all__ = ['process_pdf_and_store', 'query_legal_document', 'query_legal_document_self_query']
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
@@ -1,37 +1,50 @@
 import os
 import shutil
+from typing import Literal, Optional
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
 
-from app.schemas.models import QueryRequest, QueryResponse, TaskResponse
-from app.services.document_processor import process_pdf_task
-from app.services.query_service import query_legal_document_self_query
+from app.schemas.models import (
+    DeleteResponse,
+    QueryRequest,
+    QueryResponse,
+    TaskResponse,
+)
+from app.utils.helpers import normalize_lei_numero
 
 router = APIRouter()
 
+TipoNorma = Literal["lei", "decreto"]
+
 UPLOAD_DIR = "temp_uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
-@router.post("/upload-lei/", status_code=202, response_model=TaskResponse)
-async def upload_lei_pdf(file: UploadFile = File(...)):
+def validate_lei_numero(lei_numero: str) -> str:
     """
-    Endpoint para upload e processamento assíncrono de PDFs de legislação.
+    Normaliza o número da lei informado na requisição ('8.666' -> '8666').
 
-    Este endpoint realiza várias validações e processamentos:
-    1. Verifica se o arquivo é um PDF válido
-    2. Valida o nome do arquivo
-    3. Salva o arquivo temporariamente
-    4. Inicia processamento assíncrono via Celery
+    Raises:
+        HTTPException: 400 se o número não for numérico
+    """
+    try:
+        return normalize_lei_numero(lei_numero)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def save_uploaded_pdf(file: UploadFile) -> str:
+    """
+    Valida um PDF enviado e o salva no diretório temporário de uploads.
 
     Args:
-        file (UploadFile): Arquivo PDF da lei/decreto a ser processado
+        file (UploadFile): Arquivo PDF enviado na requisição
 
     Returns:
-        TaskResponse: Resposta contendo ID da tarefa para acompanhamento
+        str: Caminho do arquivo salvo
 
     Raises:
-        HTTPException: 
+        HTTPException:
             - 400 se o arquivo não for PDF
             - 400 se o arquivo não tiver nome válido
     """
@@ -48,6 +61,37 @@ async def upload_lei_pdf(file: UploadFile = File(...)):
 
     with open(file_path, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
+    return file_path
+
+
+@router.post("/upload-lei/", status_code=202, response_model=TaskResponse)
+def upload_lei_pdf(file: UploadFile = File(...)):
+    """
+    Endpoint para upload e processamento assíncrono de PDFs de legislação.
+
+    Este endpoint realiza várias validações e processamentos:
+    1. Verifica se o arquivo é um PDF válido
+    2. Valida o nome do arquivo
+    3. Salva o arquivo temporariamente
+    4. Inicia processamento assíncrono via Celery
+
+    Reenviar um arquivo com o mesmo nome atualiza o documento armazenado
+    em vez de duplicar seus chunks.
+
+    Args:
+        file (UploadFile): Arquivo PDF da lei/decreto a ser processado
+
+    Returns:
+        TaskResponse: Resposta contendo ID da tarefa para acompanhamento
+
+    Raises:
+        HTTPException: 
+            - 400 se o arquivo não for PDF
+            - 400 se o arquivo não tiver nome válido
+    """
+    file_path = save_uploaded_pdf(file)
+
+    from app.tasks import process_pdf_task
 
     task = process_pdf_task.delay(file_path)
 
@@ -57,8 +101,110 @@ async def upload_lei_pdf(file: UploadFile = File(...)):
     )
 
 
+@router.put("/atualizar-lei/", status_code=202, response_model=TaskResponse)
+def atualizar_lei_pdf(
+    file: UploadFile = File(...),
+    lei_numero: Optional[str] = Form(None),
+    tipo: Optional[TipoNorma] = Form(None),
+):
+    """
+    Endpoint para atualização incremental de uma lei já armazenada.
+
+    A nova versão é comparada com os chunks armazenados pelos hashes de conteúdo:
+    apenas os chunks novos ou alterados recebem embeddings e são gravados, e os
+    chunks que não existem mais são removidos. O documento é identificado pelo
+    nome do arquivo ou, se informados, pelo tipo e número da norma — leis e
+    decretos compartilham a numeração, então o número sozinho é ambíguo.
+
+    Args:
+        file (UploadFile): Arquivo PDF com a nova versão da lei/decreto
+        lei_numero (Optional[str]): Número da norma a ser substituída
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto'), obrigatório
+            com lei_numero
+
+    Returns:
+        TaskResponse: Resposta contendo ID da tarefa para acompanhamento
+
+    Raises:
+        HTTPException:
+            - 400 se lei_numero for informado sem tipo, ou tipo sem lei_numero
+            - 400 se lei_numero não for numérico
+            - 400 se o arquivo não for PDF
+            - 400 se o arquivo não tiver nome válido
+    """
+    if lei_numero and not tipo:
+        raise HTTPException(
+            status_code=400, detail="Informe 'tipo' ('lei' ou 'decreto') junto com 'lei_numero'."
+        )
+    if tipo and not lei_numero:
+        raise HTTPException(
+            status_code=400, detail="Informe 'lei_numero' junto com 'tipo'."
+        )
+    if lei_numero:
+        lei_numero = validate_lei_numero(lei_numero)
+
+    file_path = save_uploaded_pdf(file)
+
+    from app.tasks import sync_pdf_task
+
+    task = sync_pdf_task.delay(file_path, lei_numero, tipo)
+
+    return TaskResponse(
+        message="Arquivo recebido. A atualização foi iniciada em segundo plano.",
+        task_id=task.id,
+    )
+
+
+@router.delete("/remover-lei/", response_model=DeleteResponse)
+def remover_lei(
+    source: Optional[str] = None,
+    lei_numero: Optional[str] = None,
+    tipo: Optional[TipoNorma] = None,
+):
+    """
+    Endpoint para remoção de uma lei do banco vetorial.
+
+    Remove todos os chunks do documento identificado pelo nome do arquivo
+    (source) e/ou pelo tipo e número da norma.
+
+    Args:
+        source (Optional[str]): Nome do arquivo de origem
+        lei_numero (Optional[str]): Número da lei ou decreto
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto'), obrigatório
+            com lei_numero
+
+    Returns:
+        DeleteResponse: Mensagem e número de chunks removidos
+
+    Raises:
+        HTTPException:
+            - 400 se nem source nem lei_numero forem informados
+            - 400 se lei_numero for informado sem tipo
+            - 400 se lei_numero não for numérico
+            - 404 se nenhum chunk for encontrado
+    """
+    if not source and not lei_numero:
+        raise HTTPException(
+            status_code=400, detail="Informe 'source' ou 'lei_numero' para remover."
+        )
+    if lei_numero and not tipo:
+        raise HTTPException(
+            status_code=400, detail="Informe 'tipo' ('lei' ou 'decreto') junto com 'lei_numero'."
+        )
+    if lei_numero:
+        lei_numero = validate_lei_numero(lei_numero)
+
+    from app.services.document_processor import delete_document
+
+    deleted = delete_document(source=source, lei_numero=lei_numero, tipo=tipo)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Nenhum documento encontrado.")
+
+    return DeleteResponse(message="Documento removido.", deleted=deleted)
+
+
 @router.post("/consultar-lei/", response_model=QueryResponse)
-async def consultar_lei(request: QueryRequest):
+def consultar_lei(request: QueryRequest):
     """
     Endpoint para consulta de legislação usando processamento de linguagem natural.
 
@@ -72,6 +218,10 @@ async def consultar_lei(request: QueryRequest):
     - Modelo de linguagem para interpretação
     - Recuperação de contexto relevante
 
+    O endpoint é síncrono para que o FastAPI o execute no threadpool: a
+    primeira consulta importa langchain e ChromaDB (ou aguarda o aquecimento),
+    e isso não pode bloquear o event loop nem atrasar /api/health.
+
     Args:
         request (QueryRequest): Objeto contendo a pergunta do usuário
 
@@ -87,6 +237,8 @@ async def consultar_lei(request: QueryRequest):
         raise HTTPException(status_code=400, detail="A pergunta não pode estar vazia.")
 
     try:
+        from app.services.query_service import query_legal_document_self_query
+
         response = query_legal_document_self_query(request.question)
         return QueryResponse(**response)
     except Exception as e:
@@ -103,6 +255,8 @@ def health_check():
 
     Retorna status simples para confirmar que a API está operacional.
     Útil para monitoramento e health checks de infraestrutura.
+    Não depende de langchain nem do ChromaDB, que são importados apenas
+    pelos endpoints que os utilizam.
 
     Returns:
         dict: Status atual da API
@@ -37,6 +37,18 @@ class TaskResponse(BaseModel):
     task_id: str
 
 
+class DeleteResponse(BaseModel):
+    """
+    Modelo para respostas de remoção de documentos.
+
+    Attributes:
+        message (str): Mensagem descritiva sobre a remoção
+        deleted (int): Número de chunks removidos do banco vetorial
+    """
+    message: str
+    deleted: int
+
+
 class ProcessingResult(BaseModel):
     """
     Modelo para resultados de processamento.
@@ -55,11 +67,15 @@ class DocumentMetadata(BaseModel):
 
     Attributes:
         source (str): Nome do arquivo fonte
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto')
         lei_numero (Optional[str]): Número da lei ou decreto (ex: '8666')
         data_publicacao (Optional[str]): Data de publicação no formato 'DD DE MÊS DE AAAA'
+        ano (Optional[int]): Ano de publicação
         artigo (Optional[str]): Número do artigo, se aplicável
     """
     source: str
+    tipo: Optional[str] = None
     lei_numero: Optional[str] = None
     data_publicacao: Optional[str] = None
+    ano: Optional[int] = None
     artigo: Optional[str] = None
@@ -1,11 +1,15 @@
+import hashlib
+import json
 import os
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
 
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
 
-from app.services.vector_store import get_vector_store
+from app.services.vector_store import get_vector_store, update_chunk_metadatas
+from app.utils.helpers import normalize_lei_numero
 
 
 def extract_metadata(text: str) -> Dict[str, Any]:
@@ -14,16 +18,18 @@ def extract_metadata(text: str) -> Dict[str, Any]:
 
     Esta função utiliza expressões regulares para identificar e extrair informações
     importantes do texto, como:
-    - Número da lei ou decreto
-    - Data de publicação no formato oficial brasileiro
+    - Tipo da norma (lei ou decreto) e seu número
+    - Data de publicação no formato oficial brasileiro e o ano correspondente
 
     Args:
         text (str): Texto completo do documento legal
 
     Returns:
         Dict[str, Any]: Dicionário contendo os metadados extraídos:
+            - tipo: 'lei' ou 'decreto'
             - lei_numero: Número da lei/decreto sem pontuação
             - data_publicacao: Data no formato 'DD DE MÊS DE AAAA'
+            - ano: Ano de publicação como inteiro (usado no particionamento)
     """
     lei_match = re.search(r"(LEI|DECRETO)\s*N?[º°]?\s*([\d\.]+)", text, re.IGNORECASE)
     data_match = re.search(
@@ -32,44 +38,88 @@ def extract_metadata(text: str) -> Dict[str, Any]:
 
     metadata = {}
     if lei_match:
+        metadata["tipo"] = lei_match.group(1).lower()
         metadata["lei_numero"] = lei_match.group(2).replace(".", "")
     if data_match:
         metadata["data_publicacao"] = data_match.group(1)
+        metadata["ano"] = int(data_match.group(1)[-4:])
 
     return metadata
 
 
-def process_pdf_and_store(file_path: str) -> bool:
+def compute_chunk_hash(doc: Document, include_source: bool = True) -> str:
     """
-    Processa um arquivo PDF de documento legal e armazena seu conteúdo no banco de dados vetorial.
+    Calcula o hash de conteúdo de um chunk.
+
+    O hash considera o texto e os metadados do chunk, de forma que qualquer
+    alteração no texto ou nos metadados extraídos gera um novo hash. Ele é
+    usado como ID do chunk no banco vetorial, permitindo comparar uma nova
+    versão do documento com os chunks já armazenados.
+
+    O nome do arquivo (source) entra no hash quando o documento é identificado
+    por ele. Quando é identificado por tipo e número da norma, source fica de
+    fora, para que uma nova versão com outro nome de arquivo reaproveite os
+    chunks cujo texto não mudou.
+
+    Args:
+        doc (Document): Chunk com texto e metadados
+        include_source (bool): Se o metadado "source" deve compor o hash
+
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    excluded = {"chunk_hash"} if include_source else {"chunk_hash", "source"}
+    metadata = {k: v for k, v in doc.metadata.items() if k not in excluded}
+    payload = json.dumps(
+        {"content": doc.page_content, "metadata": metadata},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_pdf_chunks(
+    file_path: str,
+    metadata_overrides: Optional[Dict[str, Any]] = None,
+    hash_source: bool = True,
+) -> List[Document]:
+    """
+    Carrega um PDF de documento legal e o divide em chunks com metadados.
 
     Este é um processo complexo que envolve várias etapas:
     1. Carregamento do PDF usando PyPDFLoader
     2. Extração do texto completo e metadados básicos
     3. Divisão do documento em chunks menores para processamento eficiente
     4. Identificação e extração de números de artigos para cada chunk
-    5. Enriquecimento dos chunks com metadados
-    6. Armazenamento no banco de dados vetorial
+    5. Enriquecimento dos chunks com metadados e hash de conteúdo
 
     Parâmetros importantes:
     - Tamanho do chunk: 1000 caracteres
     - Sobreposição: 150 caracteres (para manter contexto entre chunks)
 
+    Chunks idênticos dentro do mesmo documento são armazenados uma única vez.
+
     Args:
         file_path (str): Caminho completo para o arquivo PDF
+        metadata_overrides (Optional[Dict[str, Any]]): Metadados que substituem
+            os extraídos do texto (ex.: o tipo e o número informados em uma
+            atualização)
+        hash_source (bool): Se o nome do arquivo deve compor o hash dos chunks
 
     Returns:
-        bool: True se o processamento foi bem-sucedido
+        List[Document]: Chunks enriquecidos, sem duplicatas
 
     Exemplo de metadados extraídos para cada chunk:
         {
             "source": "nome_do_arquivo.pdf",
+            "tipo": "lei",
             "lei_numero": "8666",
             "data_publicacao": "21 DE JUNHO DE 1993",
-            "artigo": "42"
+            "ano": 1993,
+            "artigo": "42",
+            "chunk_hash": "9f86d081884c7d65..."
         }
     """
-    print(f"Iniciando processamento do PDF: {file_path}")
     loader = PyPDFLoader(file_path)
     documents = loader.load()
 
@@ -77,21 +127,217 @@ def process_pdf_and_store(file_path: str) -> bool:
     base_metadata = {
         "source": os.path.basename(file_path),
         **extract_metadata(full_text),
+        **(metadata_overrides or {}),
     }
 
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=150)
     docs = text_splitter.split_documents(documents)
 
+    chunks: Dict[str, Document] = {}
     for doc in docs:
         artigo_match = re.search(r"Art\.\s*(\d+)", doc.page_content, re.IGNORECASE)
         artigo_numero = artigo_match.group(1) if artigo_match else "N/A"
         doc.metadata = {**base_metadata, "artigo": artigo_numero}
+        chunk_hash = compute_chunk_hash(doc, include_source=hash_source)
+        doc.metadata["chunk_hash"] = chunk_hash
+        chunks.setdefault(chunk_hash, doc)
+
+    return list(chunks.values())
+
+
+TIPOS_NORMA = ("lei", "decreto")
 
-    print(f"PDF dividido em {len(docs)} chunks com metadados enriquecidos.")
+
+def _build_filter(
+    source: Optional[str] = None,
+    lei_numero: Optional[str] = None,
+    tipo: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Monta o filtro de metadados que identifica um documento armazenado.
+
+    Leis e decretos compartilham a numeração (ex.: Lei 10.024 e Decreto 10.024),
+    por isso o número só identifica um documento quando acompanhado do tipo.
+    O número é normalizado por normalize_lei_numero ('8.666' -> '8666').
+
+    Raises:
+        ValueError: Se nem source nem lei_numero forem informados, se lei_numero
+            for informado sem tipo, se o número ou o tipo forem inválidos
+    """
+    if not source and not lei_numero:
+        raise ValueError("Informe 'source' ou 'lei_numero' para identificar o documento.")
+    if lei_numero and not tipo:
+        raise ValueError("Informe 'tipo' ('lei' ou 'decreto') junto com 'lei_numero'.")
+    if tipo and tipo not in TIPOS_NORMA:
+        raise ValueError(f"Tipo '{tipo}' inválido. Use 'lei' ou 'decreto'.")
+
+    conditions = []
+    if source:
+        conditions.append({"source": {"$eq": source}})
+    if lei_numero:
+        conditions.append({"lei_numero": {"$eq": normalize_lei_numero(lei_numero)}})
+    if tipo:
+        conditions.append({"tipo": {"$eq": tipo}})
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
+
+def sync_pdf(
+    file_path: str, lei_numero: Optional[str] = None, tipo: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Sincroniza um PDF com o banco vetorial, gravando apenas o que mudou.
+
+    O documento armazenado é identificado pelo nome do arquivo (source) ou,
+    se informado, pelo tipo e número da norma — o que permite substituir uma lei cujo
+    texto consolidado chegou com outro nome de arquivo. O processo:
+    1. Gera os chunks da nova versão e seus hashes de conteúdo
+    2. Consulta os IDs (hashes) dos chunks já armazenados para o documento
+    3. Gera embeddings e grava somente os chunks novos ou alterados
+    4. Atualiza o nome do arquivo nos chunks inalterados, sem novos embeddings
+    5. Remove os chunks que não existem mais na nova versão
+
+    Na identificação por número, o tipo e o número informados são gravados em
+    todos os chunks (em vez dos extraídos do texto, que podem citar outra
+    norma) e o nome do arquivo não compõe o hash. Por isso, a primeira
+    atualização por número de um documento gravado por nome de arquivo gera
+    novamente todos os embeddings; as seguintes são incrementais.
+
+    Args:
+        file_path (str): Caminho completo para o arquivo PDF
+        lei_numero (Optional[str]): Número da norma a ser substituída. Se omitido,
+            o documento é identificado pelo nome do arquivo
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto'), obrigatório
+            quando lei_numero é informado (e vice-versa)
+
+    Returns:
+        Dict[str, int]: Contagem de chunks adicionados, removidos e inalterados
+
+    Raises:
+        ValueError: Se lei_numero e tipo não forem informados juntos, se algum
+            deles for inválido, ou se o PDF
+            não gerar nenhum chunk (ex.: PDF digitalizado). Nesse caso nada é
+            removido, para que uma extração falha não apague a versão armazenada
+    """
+    if tipo and not lei_numero:
+        raise ValueError("Informe 'lei_numero' junto com 'tipo'.")
+    if lei_numero:
+        lei_numero = normalize_lei_numero(lei_numero)
+
+    where = _build_filter(
+        source=None if lei_numero else os.path.basename(file_path),
+        lei_numero=lei_numero,
+        tipo=tipo if lei_numero else None,
+    )
+
+    print(f"Sincronizando PDF: {file_path}")
+    chunks = load_pdf_chunks(
+        file_path,
+        metadata_overrides={"tipo": tipo, "lei_numero": lei_numero} if lei_numero else None,
+        hash_source=not lei_numero,
+    )
+    if not chunks:
+        raise ValueError(
+            f"Nenhum texto extraído de {os.path.basename(file_path)} (PDF digitalizado "
+            "ou sem camada de texto?). O documento armazenado não foi alterado."
+        )
+    new_ids = [doc.metadata["chunk_hash"] for doc in chunks]
 
     vectordb = get_vector_store()
-    vectordb.add_documents(docs)
+    stored = vectordb.get(where=where, include=["metadatas"])
+    stored_metadatas = dict(zip(stored["ids"], stored["metadatas"]))
+
+    to_add = [doc for doc in chunks if doc.metadata["chunk_hash"] not in stored_metadatas]
+    to_delete = sorted(set(stored_metadatas) - set(new_ids))
+    to_relabel = [
+        doc
+        for doc in chunks
+        if doc.metadata["chunk_hash"] in stored_metadatas
+        and stored_metadatas[doc.metadata["chunk_hash"]].get("source")
+        != doc.metadata["source"]
+    ]
+
+    if to_add:
+        vectordb.add_documents(
+            to_add, ids=[doc.metadata["chunk_hash"] for doc in to_add]
+        )
+    if to_relabel:
+        update_chunk_metadatas(
+            vectordb,
+            ids=[doc.metadata["chunk_hash"] for doc in to_relabel],
+            metadatas=[doc.metadata for doc in to_relabel],
+        )
+    if to_delete:
+        vectordb.delete(ids=to_delete)
     vectordb.persist()
 
+    result = {
+        "adicionados": len(to_add),
+        "removidos": len(to_delete),
+        "inalterados": len(chunks) - len(to_add),
+    }
+    print(f"Documento {file_path} sincronizado: {result}")
+    return result
+
+
+def process_pdf_and_store(file_path: str) -> bool:
+    """
+    Processa um arquivo PDF de documento legal e armazena seu conteúdo no banco de dados vetorial.
+
+    Os chunks são gerados por load_pdf_chunks e gravados no shard do tipo/década
+    da norma. Como o armazenamento é feito via sync_pdf, reenviar o mesmo
+    arquivo não duplica chunks: apenas trechos alterados são gravados e os
+    trechos obsoletos são removidos.
+
+    Args:
+        file_path (str): Caminho completo para o arquivo PDF
+
+    Returns:
+        bool: True se o processamento foi bem-sucedido
+    """
+    print(f"Iniciando processamento do PDF: {file_path}")
+    sync_pdf(file_path)
     print(f"Documento {file_path} processado e armazenado com sucesso.")
     return True
+
+
+def delete_document(
+    source: Optional[str] = None,
+    lei_numero: Optional[str] = None,
+    tipo: Optional[str] = None,
+) -> int:
+    """
+    Remove do banco vetorial todos os chunks de um documento.
+
+    Args:
+        source (Optional[str]): Nome do arquivo de origem
+        lei_numero (Optional[str]): Número da lei ou decreto
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto'), obrigatório
+            quando lei_numero é informado
+
+    Returns:
+        int: Número de chunks removidos
+
+    Raises:
+        ValueError: Se nem source nem lei_numero forem informados, ou se
+            lei_numero for informado sem um tipo válido
+    """
+    where = _build_filter(source=source, lei_numero=lei_numero, tipo=tipo)
+    vectordb = get_vector_store()
+    ids = vectordb.get(where=where, include=[])["ids"]
+    if ids:
+        vectordb.delete(ids=ids)
+        vectordb.persist()
+    print(f"{len(ids)} chunks removidos para o filtro {where}.")
+    return len(ids)
+
+
+def list_sources() -> Set[str]:
+    """
+    Lista os arquivos de origem presentes no banco vetorial.
+
+    Returns:
+        Set[str]: Nomes dos arquivos (metadado "source") armazenados
+    """
+    vectordb = get_vector_store()
+    metadatas = vectordb.get(include=["metadatas"])["metadatas"]
+    return {metadata["source"] for metadata in metadatas if metadata.get("source")}
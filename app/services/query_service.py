@@ -5,6 +5,7 @@ from langchain.chains import RetrievalQA
 from langchain.chains.query_constructor.base import AttributeInfo
 from langchain.prompts import PromptTemplate
 from langchain.retrievers.self_query.base import SelfQueryRetriever
+from langchain_community.query_constructors.chroma import ChromaTranslator
 
 from app.services.vector_store import get_vector_store
 
@@ -48,8 +49,10 @@ def get_metadata_field_info() -> list[AttributeInfo]:
 
     Define a estrutura e descrição dos metadados disponíveis para busca:
     - source: Identificação do arquivo fonte
+    - tipo: Tipo da norma (lei ou decreto)
     - lei_numero: Número da legislação para buscas específicas
     - data_publicacao: Data de publicação para análise temporal
+    - ano: Ano de publicação, usado também para rotear a busca entre shards
 
     Returns:
         list[AttributeInfo]: Lista de descritores de metadados para busca
@@ -60,6 +63,11 @@ def get_metadata_field_info() -> list[AttributeInfo]:
             description="O nome do arquivo PDF de onde o texto foi extraído. Ex: 'lei_8666_1993.pdf'",
             type="string",
         ),
+        AttributeInfo(
+            name="tipo",
+            description="O tipo da norma, em minúsculas. Valores possíveis: 'lei' ou 'decreto'",
+            type="string",
+        ),
         AttributeInfo(
             name="lei_numero",
             description="O número oficial da lei ou decreto. Use isto para perguntas sobre uma lei específica. Ex: '8666', '10520'",
@@ -70,6 +78,11 @@ def get_metadata_field_info() -> list[AttributeInfo]:
             description="A data de publicação da lei. Ex: '21 DE JUNHO DE 1993'",
             type="string",
         ),
+        AttributeInfo(
+            name="ano",
+            description="O ano de publicação da lei. Use para perguntas sobre períodos. Ex: 1993",
+            type="integer",
+        ),
     ]
 
 
@@ -86,6 +99,8 @@ def query_legal_document_self_query(question: str) -> Dict[str, Any]:
     2. Configuração do Recuperador:
        - Utiliza SelfQueryRetriever para permitir consultas estruturadas
        - Configura descrição do conteúdo e campos de metadados
+       - Usa o tradutor de filtros do ChromaDB, cujo filtro também roteia
+         a busca para os shards relevantes
        - Habilita modo verboso para rastreamento
 
     3. Configuração da Cadeia QA:
@@ -118,6 +133,7 @@ def query_legal_document_self_query(question: str) -> Dict[str, Any]:
         vectordb,
         document_content_description,
         get_metadata_field_info(),
+        structured_query_translator=ChromaTranslator(),
         verbose=True,
     )
 
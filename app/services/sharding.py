@@ -0,0 +1,309 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.config import CHROMA_COLLECTION_NAME, CHROMA_SHARD_KEY
+
+SHARD_SEPARATOR = "__"
+SHARD_KEY_PARTS = {
+    "tipo_decada": ["tipo", "decada"],
+    "tipo": ["tipo"],
+    "decada": ["decada"],
+    "none": [],
+}
+
+TIPO_DESCONHECIDO = "outro"
+DECADA_DESCONHECIDA = "sem_data"
+
+
+def get_shard_key_parts(shard_key: str = CHROMA_SHARD_KEY) -> List[str]:
+    """
+    Retorna os componentes que formam a chave de particionamento configurada.
+
+    Args:
+        shard_key (str): Chave de particionamento ("tipo_decada", "tipo", "decada" ou "none")
+
+    Returns:
+        List[str]: Componentes da chave, na ordem em que aparecem no nome da coleção
+
+    Raises:
+        ValueError: Se a chave de particionamento não for suportada
+    """
+    if shard_key not in SHARD_KEY_PARTS:
+        raise ValueError(
+            f"Chave de particionamento '{shard_key}' inválida. "
+            f"Use uma de: {', '.join(SHARD_KEY_PARTS)}."
+        )
+    return SHARD_KEY_PARTS[shard_key]
+
+
+def _shard_value(part: str, metadata: Dict[str, Any]) -> str:
+    if part == "tipo":
+        return str(metadata.get("tipo") or TIPO_DESCONHECIDO).lower()
+    ano = metadata.get("ano")
+    if ano is None:
+        return DECADA_DESCONHECIDA
+    return str((int(ano) // 10) * 10)
+
+
+def get_shard_name(
+    metadata: Dict[str, Any],
+    base_name: str = CHROMA_COLLECTION_NAME,
+    shard_key: str = CHROMA_SHARD_KEY,
+) -> str:
+    """
+    Determina a coleção (shard) onde um chunk deve ser armazenado.
+
+    O nome é composto pelo nome base da coleção seguido dos valores da chave
+    de particionamento, por exemplo: "leis_decretos__lei__1990".
+    Chunks sem tipo ou sem ano vão para os shards "outro" e "sem_data".
+
+    Args:
+        metadata (Dict[str, Any]): Metadados do chunk (usa "tipo" e "ano")
+        base_name (str): Nome base das coleções
+        shard_key (str): Chave de particionamento configurada
+
+    Returns:
+        str: Nome da coleção de destino
+    """
+    values = [_shard_value(part, metadata) for part in get_shard_key_parts(shard_key)]
+    return SHARD_SEPARATOR.join([base_name, *values])
+
+
+def parse_shard_name(
+    name: str,
+    base_name: str = CHROMA_COLLECTION_NAME,
+    shard_key: str = CHROMA_SHARD_KEY,
+) -> Optional[Dict[str, str]]:
+    """
+    Converte o nome de uma coleção de volta para os valores da chave de particionamento.
+
+    Args:
+        name (str): Nome da coleção
+        base_name (str): Nome base das coleções
+        shard_key (str): Chave de particionamento configurada
+
+    Returns:
+        Optional[Dict[str, str]]: Valores por componente, ou None se a coleção
+            não pertencer ao conjunto de shards configurado
+    """
+    parts = get_shard_key_parts(shard_key)
+    prefix = base_name + SHARD_SEPARATOR
+    if not parts or not name.startswith(prefix):
+        return None
+    values = name[len(prefix):].split(SHARD_SEPARATOR)
+    if len(values) != len(parts):
+        return None
+    return dict(zip(parts, values))
+
+
+def _is_year(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _merge_bounds(
+    bounds: Tuple[Optional[int], Optional[int]], op: str, value: Any
+) -> Tuple[Optional[int], Optional[int]]:
+    low, high = bounds
+    if op in ("$eq", "$gte", "$gt"):
+        start = value + 1 if op == "$gt" else value
+        low = start if low is None else max(low, start)
+    if op in ("$eq", "$lte", "$lt"):
+        end = value - 1 if op == "$lt" else value
+        high = end if high is None else min(high, end)
+    return low, high
+
+
+def extract_routing(
+    where: Optional[Dict[str, Any]],
+) -> Optional[Tuple[Optional[Set[str]], Tuple[Optional[int], Optional[int]]]]:
+    """
+    Extrai do filtro de metadados as restrições úteis para roteamento.
+
+    Apenas condições que restringem o conjunto de shards de forma segura são
+    consideradas: igualdade/pertinência em "tipo" e comparações em "ano",
+    combinadas por "$and". Filtros com "$or" não são roteados, e comparações
+    em "ano" com valores não inteiros (ex.: "mil", 1990.5) são ignoradas,
+    ou seja, não restringem os shards.
+
+    Args:
+        where (Optional[Dict[str, Any]]): Filtro no formato do ChromaDB
+
+    Returns:
+        Optional[Tuple]: Tupla (tipos, (ano_min, ano_max)), ou None se o filtro
+            não permitir roteamento
+    """
+    tipos: Optional[Set[str]] = None
+    bounds: Tuple[Optional[int], Optional[int]] = (None, None)
+    if not where:
+        return tipos, bounds
+
+    for key, condition in where.items():
+        if key == "$and":
+            for sub in condition:
+                routing = extract_routing(sub)
+                if routing is None:
+                    continue
+                sub_tipos, (sub_low, sub_high) = routing
+                if sub_tipos is not None:
+                    tipos = sub_tipos if tipos is None else tipos & sub_tipos
+                if sub_low is not None:
+                    bounds = _merge_bounds(bounds, "$gte", sub_low)
+                if sub_high is not None:
+                    bounds = _merge_bounds(bounds, "$lte", sub_high)
+        elif key == "$or":
+            return None
+        elif key in ("tipo", "ano"):
+            ops = condition if isinstance(condition, dict) else {"$eq": condition}
+            for op, value in ops.items():
+                if key == "tipo" and op in ("$eq", "$in"):
+                    values = value if isinstance(value, list) else [value]
+                    values = {str(v).lower() for v in values}
+                    tipos = values if tipos is None else tipos & values
+                elif (
+                    key == "ano"
+                    and op in ("$eq", "$gt", "$gte", "$lt", "$lte")
+                    and _is_year(value)
+                ):
+                    bounds = _merge_bounds(bounds, op, value)
+
+    return tipos, bounds
+
+
+def route_shards(
+    shards: List[str],
+    where: Optional[Dict[str, Any]] = None,
+    base_name: str = CHROMA_COLLECTION_NAME,
+    shard_key: str = CHROMA_SHARD_KEY,
+) -> List[str]:
+    """
+    Seleciona os shards que podem conter resultados para o filtro informado.
+
+    Quando o filtro não restringe tipo nem ano, todos os shards são retornados
+    e a busca é distribuída entre eles.
+
+    Args:
+        shards (List[str]): Nomes das coleções existentes
+        where (Optional[Dict[str, Any]]): Filtro de metadados no formato do ChromaDB
+        base_name (str): Nome base das coleções
+        shard_key (str): Chave de particionamento configurada
+
+    Returns:
+        List[str]: Nomes das coleções que devem ser consultadas
+    """
+    routing = extract_routing(where)
+    if routing is None:
+        return list(shards)
+    tipos, (low, high) = routing
+
+    selected = []
+    for name in shards:
+        values = parse_shard_name(name, base_name, shard_key)
+        if values is None:
+            continue
+        if tipos is not None and "tipo" in values and values["tipo"] not in tipos:
+            continue
+        if (low is not None or high is not None) and "decada" in values:
+            if values["decada"] == DECADA_DESCONHECIDA:
+                continue
+            decada = int(values["decada"])
+            if low is not None and decada + 9 < low:
+                continue
+            if high is not None and decada > high:
+                continue
+        selected.append(name)
+    return selected
+
+
+def _tipo_satisfied(op: str, value: Any, tipo: str) -> bool:
+    if op == "$eq":
+        return value == tipo
+    if op == "$in":
+        return isinstance(value, list) and tipo in value
+    if op == "$ne":
+        return value != tipo
+    if op == "$nin":
+        return isinstance(value, list) and tipo not in value
+    return False
+
+
+def _ano_satisfied(op: str, value: Any, low: int, high: int) -> bool:
+    if not _is_year(value):
+        return False
+    if op == "$gt":
+        return value < low
+    if op == "$gte":
+        return value <= low
+    if op == "$lt":
+        return value > high
+    if op == "$lte":
+        return value >= high
+    if op == "$ne":
+        return not low <= value <= high
+    return False
+
+
+def _condition_satisfied(key: str, condition: Any, values: Dict[str, str]) -> bool:
+    ops = condition if isinstance(condition, dict) else {"$eq": condition}
+    if not ops:
+        return False
+    if key == "tipo":
+        tipo = values.get("tipo")
+        if tipo is None or tipo == TIPO_DESCONHECIDO:
+            return False
+        return all(_tipo_satisfied(op, value, tipo) for op, value in ops.items())
+    if key == "ano":
+        decada = values.get("decada")
+        if decada is None or decada == DECADA_DESCONHECIDA:
+            return False
+        low = int(decada)
+        return all(_ano_satisfied(op, value, low, low + 9) for op, value in ops.items())
+    return False
+
+
+def _prune(where: Dict[str, Any], values: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    if len(where) != 1:
+        return where
+    key, condition = next(iter(where.items()))
+    if key == "$and":
+        remaining = [
+            pruned
+            for pruned in (_prune(sub, values) for sub in condition)
+            if pruned is not None
+        ]
+        if not remaining:
+            return None
+        return remaining[0] if len(remaining) == 1 else {"$and": remaining}
+    if _condition_satisfied(key, condition, values):
+        return None
+    return where
+
+
+def prune_filter(
+    where: Optional[Dict[str, Any]],
+    shard_name: str,
+    base_name: str = CHROMA_COLLECTION_NAME,
+    shard_key: str = CHROMA_SHARD_KEY,
+) -> Optional[Dict[str, Any]]:
+    """
+    Remove do filtro as condições que todos os chunks do shard já satisfazem.
+
+    Um shard "lei__1990" contém apenas chunks com tipo "lei" e ano entre 1990
+    e 1999; condições como {"tipo": "lei"} ou {"ano": {"$gte": 1990}} são
+    redundantes nele e fariam o ChromaDB filtrar a coleção inteira antes da
+    busca vetorial. Apenas condições simples sobre "tipo" e "ano", isoladas
+    ou dentro de "$and", são removidas; os shards "outro" e "sem_data" nunca
+    têm condições removidas.
+
+    Args:
+        where (Optional[Dict[str, Any]]): Filtro no formato do ChromaDB
+        shard_name (str): Nome da coleção que será consultada
+        base_name (str): Nome base das coleções
+        shard_key (str): Chave de particionamento configurada
+
+    Returns:
+        Optional[Dict[str, Any]]: Filtro restante para o shard, ou None se
+            nenhuma condição restar
+    """
+    values = parse_shard_name(shard_name, base_name, shard_key)
+    if not where or values is None:
+        return where
+    return _prune(where, values)
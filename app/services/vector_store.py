@@ -1,26 +1,449 @@
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import chromadb
 from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-from app.config import CHROMA_COLLECTION_NAME, CHROMA_PERSIST_DIRECTORY
+from app.config import (
+    CHROMA_COLLECTION_NAME,
+    CHROMA_PERSIST_DIRECTORY,
+    CHROMA_SHARD_KEY,
+    CHROMA_SHARD_LIST_TTL,
+    CHROMA_SHARD_MAX_WORKERS,
+)
+from app.services.sharding import (
+    get_shard_name,
+    parse_shard_name,
+    prune_filter,
+    route_shards,
+)
+
+
+_chroma_client = None
+_chroma_client_lock = threading.Lock()
+_vector_store = None
+_vector_store_lock = threading.Lock()
+
+
+def get_chroma_client():
+    """
+    Retorna o cliente persistente do ChromaDB compartilhado pelo processo.
+
+    A criação é protegida por um lock porque o aquecimento em segundo plano
+    e a primeira requisição podem pedir o cliente ao mesmo tempo, e o ChromaDB
+    não suporta inicializações concorrentes do mesmo diretório.
+
+    Returns:
+        chromadb.ClientAPI: Cliente apontando para o diretório de persistência
+    """
+    global _chroma_client
+    with _chroma_client_lock:
+        if _chroma_client is None:
+            _chroma_client = chromadb.PersistentClient(path=CHROMA_PERSIST_DIRECTORY)
+        return _chroma_client
+
+
+class ShardedChroma(VectorStore):
+    """
+    Banco vetorial distribuído em várias coleções do ChromaDB.
+
+    Cada chunk é gravado na coleção correspondente à chave de particionamento
+    (por exemplo, tipo de norma e década de publicação). Nas buscas, o filtro
+    de metadados é usado para selecionar apenas os shards relevantes; sem
+    restrição de tipo ou ano, a consulta é distribuída em paralelo entre todos
+    os shards e os resultados são combinados pela distância.
+
+    A consulta é convertida em embedding uma única vez e reutilizada em
+    todos os shards. Em cada shard, as condições do filtro que a própria
+    partição já garante são removidas (ver prune_filter). A lista de shards
+    é reaproveitada nas buscas por até CHROMA_SHARD_LIST_TTL segundos, e as
+    buscas distribuídas usam um único pool de threads por instância.
+    """
+
+    def __init__(
+        self,
+        embedding_function: Embeddings,
+        client: Any = None,
+        base_name: str = CHROMA_COLLECTION_NAME,
+        shard_key: str = CHROMA_SHARD_KEY,
+        max_workers: int = CHROMA_SHARD_MAX_WORKERS,
+        shard_list_ttl: float = CHROMA_SHARD_LIST_TTL,
+    ):
+        self._embedding_function = embedding_function
+        self._client = client if client is not None else get_chroma_client()
+        self._base_name = base_name
+        self._shard_key = shard_key
+        self._max_workers = max_workers
+        self._shard_list_ttl = shard_list_ttl
+        self._shards: Dict[str, Chroma] = {}
+        self._shard_names: Optional[List[str]] = None
+        self._shard_names_loaded_at = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    def get_shard(self, name: str) -> Chroma:
+        """
+        Retorna (criando, se necessário) a instância Chroma de um shard.
+
+        Args:
+            name (str): Nome da coleção
+
+        Returns:
+            Chroma: Instância ligada à coleção informada
+        """
+        with self._lock:
+            if name not in self._shards:
+                self._shards[name] = Chroma(
+                    client=self._client,
+                    persist_directory=CHROMA_PERSIST_DIRECTORY,
+                    collection_name=name,
+                    embedding_function=self._embedding_function,
+                )
+            return self._shards[name]
+
+    def list_shards(self, refresh: bool = False) -> List[str]:
+        """
+        Lista as coleções existentes que pertencem a este conjunto de shards.
+
+        A lista é mantida em cache por CHROMA_SHARD_LIST_TTL segundos, pois
+        shards podem ser criados por outros processos (ex.: o worker Celery).
+
+        Args:
+            refresh (bool): Se True, consulta o ChromaDB mesmo com o cache válido
+
+        Returns:
+            List[str]: Nomes das coleções, em ordem alfabética
+        """
+        expired = time.monotonic() - self._shard_names_loaded_at > self._shard_list_ttl
+        if refresh or expired or self._shard_names is None:
+            names = [getattr(c, "name", c) for c in self._client.list_collections()]
+            self._shard_names = sorted(
+                name
+                for name in names
+                if parse_shard_name(name, self._base_name, self._shard_key) is not None
+            )
+            self._shard_names_loaded_at = time.monotonic()
+        return list(self._shard_names)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="chroma-shard"
+                )
+            return self._executor
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """
+        Agrupa os textos por shard e grava cada grupo na coleção correspondente.
+
+        Args:
+            texts (Iterable[str]): Textos dos chunks
+            metadatas (Optional[List[dict]]): Metadados de cada chunk
+            ids (Optional[List[str]]): Identificadores opcionais de cada chunk
+
+        Returns:
+            List[str]: Identificadores gravados, na ordem de entrada
+        """
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        groups: Dict[str, List[int]] = {}
+        for index, metadata in enumerate(metadatas):
+            name = get_shard_name(metadata, self._base_name, self._shard_key)
+            groups.setdefault(name, []).append(index)
+
+        result_ids: List[Optional[str]] = [None] * len(texts)
+        for name, indexes in groups.items():
+            shard_ids = self.get_shard(name).add_texts(
+                [texts[i] for i in indexes],
+                metadatas=[metadatas[i] for i in indexes],
+                ids=[ids[i] for i in indexes] if ids else None,
+                **kwargs,
+            )
+            for i, shard_id in zip(indexes, shard_ids):
+                result_ids[i] = shard_id
+        self.list_shards(refresh=True)
+        return result_ids  # type: ignore[return-value]
+
+    def get(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, List]:
+        """
+        Recupera chunks de todos os shards compatíveis com o filtro.
+
+        A lista de shards é sempre atualizada, pois o resultado é usado para
+        sincronizar e remover documentos.
+
+        Args:
+            where (Optional[Dict[str, Any]]): Filtro de metadados no formato do ChromaDB
+            include (Optional[List[str]]): Campos a retornar além dos IDs
+                (por padrão, apenas os metadados)
+
+        Returns:
+            Dict[str, List]: Dicionário com as listas "ids" e "metadatas"
+        """
+        include = ["metadatas"] if include is None else include
+        result: Dict[str, List] = {"ids": [], "metadatas": []}
+        shards = route_shards(
+            self.list_shards(refresh=True), where, self._base_name, self._shard_key
+        )
+        for name in shards:
+            shard_where = prune_filter(where, name, self._base_name, self._shard_key)
+            shard_result = self.get_shard(name).get(where=shard_where, include=include)
+            for key in result:
+                result[key].extend(shard_result.get(key) or [])
+        return result
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> None:
+        """
+        Remove chunks pelos IDs em todos os shards.
+
+        Args:
+            ids (Optional[List[str]]): IDs dos chunks a remover
+        """
+        if not ids:
+            return
+        for name in self.list_shards(refresh=True):
+            self.get_shard(name).delete(ids=ids, **kwargs)
+
+    def update_metadatas(self, ids: List[str], metadatas: List[dict]) -> None:
+        """
+        Atualiza os metadados de chunks existentes sem recalcular embeddings.
+
+        Os novos metadados devem manter o tipo e o ano do chunk, de modo que
+        ele continue no mesmo shard.
+
+        Args:
+            ids (List[str]): IDs dos chunks
+            metadatas (List[dict]): Novos metadados de cada chunk
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, metadata in enumerate(metadatas):
+            name = get_shard_name(metadata, self._base_name, self._shard_key)
+            groups.setdefault(name, []).append(index)
+        for name, indexes in groups.items():
+            self.get_shard(name)._collection.update(
+                ids=[ids[i] for i in indexes],
+                metadatas=[metadatas[i] for i in indexes],
+            )
+
+    def _search_shard(
+        self,
+        name: str,
+        embedding: List[float],
+        k: int,
+        filter: Optional[Dict[str, Any]],
+    ) -> List[Tuple[Document, float]]:
+        shard_filter = prune_filter(filter, name, self._base_name, self._shard_key)
+        return self.get_shard(name).similarity_search_by_vector_with_relevance_scores(
+            embedding, k=k, filter=shard_filter
+        )
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        """
+        Busca os k chunks mais próximos nos shards selecionados pelo filtro.
+
+        Args:
+            query (str): Texto da consulta
+            k (int): Número de resultados
+            filter (Optional[Dict[str, Any]]): Filtro de metadados no formato do ChromaDB
+
+        Returns:
+            List[Tuple[Document, float]]: Documentos e distâncias, do mais próximo
+                ao mais distante
+        """
+        shards = route_shards(
+            self.list_shards(), filter, self._base_name, self._shard_key
+        )
+        if not shards:
+            return []
+
+        embedding = self._embedding_function.embed_query(query)
+        if len(shards) == 1:
+            results = [self._search_shard(shards[0], embedding, k, filter)]
+        else:
+            results = list(
+                self._get_executor().map(
+                    lambda name: self._search_shard(name, embedding, k, filter),
+                    shards,
+                )
+            )
+        return heapq.nsmallest(k, chain.from_iterable(results), key=lambda r: r[1])
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        results = self.similarity_search_with_score(query, k=k, filter=filter, **kwargs)
+        return [doc for doc, _ in results]
+
+    def persist(self) -> None:
+        for shard in self._shards.values():
+            shard.persist()
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        **kwargs: Any,
+    ) -> "ShardedChroma":
+        store = cls(embedding_function=embedding, **kwargs)
+        store.add_texts(texts, metadatas=metadatas)
+        return store
 
 
 def get_vector_store():
     """
-    Inicializa e retorna uma instância do banco de dados vetorial ChromaDB.
+    Retorna a instância do banco de dados vetorial ChromaDB compartilhada pelo processo.
 
     Esta função configura o ChromaDB com embeddings do Google AI para armazenamento
     e recuperação eficiente de documentos legais. O processo envolve:
     1. Inicialização do modelo de embeddings do Google AI
     2. Configuração do ChromaDB com diretório de persistência
-    3. Definição da coleção específica para leis e decretos
+    3. Definição das coleções de leis e decretos, particionadas conforme
+       CHROMA_SHARD_KEY (ou uma coleção única quando a chave é "none")
+
+    A instância é criada uma única vez, para que as coleções abertas, a lista
+    de shards e o pool de threads sejam reaproveitados entre as consultas.
 
     Returns:
-        Chroma: Instância configurada do ChromaDB para armazenamento vetorial
-    """
-    embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-    vectordb = Chroma(
-        persist_directory=CHROMA_PERSIST_DIRECTORY,
-        embedding_function=embeddings,
-        collection_name=CHROMA_COLLECTION_NAME,
-    )
-    return vectordb
+        VectorStore: ShardedChroma ou, sem particionamento, uma instância Chroma
+    """
+    global _vector_store
+    with _vector_store_lock:
+        if _vector_store is None:
+            embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
+            if CHROMA_SHARD_KEY == "none":
+                _vector_store = Chroma(
+                    client=get_chroma_client(),
+                    persist_directory=CHROMA_PERSIST_DIRECTORY,
+                    embedding_function=embeddings,
+                    collection_name=CHROMA_COLLECTION_NAME,
+                )
+            else:
+                _vector_store = ShardedChroma(embedding_function=embeddings)
+        return _vector_store
+
+
+def update_chunk_metadatas(
+    vectordb: VectorStore, ids: List[str], metadatas: List[dict]
+) -> None:
+    """
+    Atualiza os metadados de chunks existentes sem recalcular embeddings.
+
+    Funciona tanto com ShardedChroma quanto com a coleção única (Chroma).
+
+    Args:
+        vectordb (VectorStore): Banco vetorial retornado por get_vector_store
+        ids (List[str]): IDs dos chunks
+        metadatas (List[dict]): Novos metadados de cada chunk
+    """
+    if isinstance(vectordb, ShardedChroma):
+        vectordb.update_metadatas(ids, metadatas)
+    else:
+        vectordb._collection.update(ids=ids, metadatas=metadatas)
+
+
+def migrate_monolithic_collection(batch_size: int = 1000) -> int:
+    """
+    Move os chunks da coleção única "leis_decretos" para os shards.
+
+    Antes do particionamento, todos os chunks eram gravados em uma única
+    coleção, que não é consultada quando CHROMA_SHARD_KEY define shards.
+    Esta função copia cada chunk, com seu embedding original (sem chamar a API
+    de embeddings), para o shard correspondente e remove a coleção antiga:
+    1. Lê a coleção única em lotes, incluindo embeddings, textos e metadados
+    2. Preenche o metadado "ano" a partir de "data_publicacao", quando ausente
+    3. Grava cada lote nos shards, preservando os IDs
+    4. Remove a coleção única ao final
+
+    Chunks antigos não possuem o metadado "tipo" e vão para os shards "outro";
+    eles são substituídos na próxima sincronização do documento.
+
+    Args:
+        batch_size (int): Quantidade de chunks lidos por lote
+
+    Returns:
+        int: Número de chunks migrados
+
+    Raises:
+        ValueError: Se o particionamento estiver desativado (CHROMA_SHARD_KEY="none")
+    """
+    if CHROMA_SHARD_KEY == "none":
+        raise ValueError("O particionamento está desativado (CHROMA_SHARD_KEY='none').")
+
+    client = get_chroma_client()
+    names = [getattr(c, "name", c) for c in client.list_collections()]
+    if CHROMA_COLLECTION_NAME not in names:
+        print(f"Coleção '{CHROMA_COLLECTION_NAME}' não encontrada. Nada a migrar.")
+        return 0
+
+    source = client.get_collection(CHROMA_COLLECTION_NAME)
+    shards: Dict[str, Any] = {}
+    migrated = 0
+    while True:
+        batch = source.get(
+            limit=batch_size,
+            offset=migrated,
+            include=["embeddings", "documents", "metadatas"],
+        )
+        if not batch["ids"]:
+            break
+
+        groups: Dict[str, List[int]] = {}
+        for index, metadata in enumerate(batch["metadatas"]):
+            metadata = dict(metadata or {})
+            data_publicacao = str(metadata.get("data_publicacao", ""))
+            if "ano" not in metadata and data_publicacao[-4:].isdigit():
+                metadata["ano"] = int(data_publicacao[-4:])
+            batch["metadatas"][index] = metadata
+            groups.setdefault(get_shard_name(metadata), []).append(index)
+
+        for name, indexes in groups.items():
+            if name not in shards:
+                shards[name] = client.get_or_create_collection(
+                    name=name, embedding_function=None, metadata=source.metadata
+                )
+            shards[name].upsert(
+                ids=[batch["ids"][i] for i in indexes],
+                embeddings=[batch["embeddings"][i] for i in indexes],
+                documents=[batch["documents"][i] for i in indexes],
+                metadatas=[batch["metadatas"][i] for i in indexes],
+            )
+        migrated += len(batch["ids"])
+        print(f"{migrated} chunks migrados...")
+
+    client.delete_collection(CHROMA_COLLECTION_NAME)
+    print(f"Migração concluída: {migrated} chunks distribuídos em {len(shards)} shards.")
+    return migrated
@@ -0,0 +1,33 @@
+import time
+
+
+def warmup_services(open_client: bool = True) -> float:
+    """
+    Pré-carrega as dependências pesadas usadas pelos serviços.
+
+    Os módulos de serviço importam langchain, langchain_google_genai, ChromaDB e
+    o stack de self-query (lark) no nível de módulo. Como as rotas e as tarefas
+    só os importam quando são usados, esta função permite antecipar esse custo
+    em uma fase de aquecimento, fora do caminho da primeira requisição:
+    1. Importa os serviços de processamento e de consulta
+    2. Abre o cliente persistente do ChromaDB, se solicitado
+
+    Args:
+        open_client (bool): Se o cliente do ChromaDB deve ser aberto. Deve ser
+            False em processos que ainda serão bifurcados (fork), como o processo
+            principal do worker Celery, para não compartilhar conexões com os filhos
+
+    Returns:
+        float: Tempo gasto no aquecimento, em segundos
+    """
+    start = time.perf_counter()
+
+    from app.services import document_processor, query_service  # noqa: F401
+    from app.services.vector_store import get_chroma_client
+
+    if open_client:
+        get_chroma_client()
+
+    elapsed = time.perf_counter() - start
+    print(f"Aquecimento dos serviços concluído em {elapsed:.2f}s.")
+    return elapsed
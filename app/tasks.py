@@ -1,13 +1,28 @@
 import os
+from typing import Optional
 
 from celery import Celery # type: ignore
+from celery.signals import worker_init # type: ignore
 
-from app.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
-from app.processing import process_pdf_and_store
+from app.config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, WARMUP_ON_STARTUP
 
 celery_app = Celery("tasks", broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
 
 
+@worker_init.connect
+def warmup_worker(**kwargs):
+    """
+    Aquece o processo principal do worker antes da criação dos processos filhos.
+
+    Com o pool prefork, os módulos carregados aqui são herdados pelos filhos,
+    que deixam de pagar o custo de importar langchain e ChromaDB na primeira tarefa.
+    """
+    if WARMUP_ON_STARTUP:
+        from app.services.warmup import warmup_services
+
+        warmup_services(open_client=False)
+
+
 @celery_app.task
 def process_pdf_task(file_path: str):
     """
@@ -31,6 +46,8 @@ def process_pdf_task(file_path: str):
             - status: "Sucesso" ou "Erro"
             - message: Mensagem descritiva do resultado
     """
+    from app.services.document_processor import process_pdf_and_store
+
     try:
         process_pdf_and_store(file_path)
         os.remove(file_path)
@@ -40,3 +57,44 @@ def process_pdf_task(file_path: str):
         }
     except Exception as e:
         return {"status": "Erro", "message": str(e)}
+
+
+@celery_app.task
+def sync_pdf_task(
+    file_path: str, lei_numero: Optional[str] = None, tipo: Optional[str] = None
+):
+    """
+    Tarefa Celery para atualização incremental de um documento já armazenado.
+
+    Compara os chunks da nova versão com os armazenados, grava apenas os
+    chunks novos ou alterados e remove os obsoletos. Remove o arquivo
+    temporário após o processamento.
+
+    Args:
+        file_path (str): Caminho para o arquivo PDF temporário
+        lei_numero (Optional[str]): Número da norma a ser substituída. Se omitido,
+            o documento é identificado pelo nome do arquivo
+        tipo (Optional[str]): Tipo da norma ('lei' ou 'decreto'), obrigatório
+            quando lei_numero é informado
+
+    Returns:
+        dict: Dicionário contendo:
+            - status: "Sucesso" ou "Erro"
+            - message: Mensagem descritiva do resultado, com a contagem de chunks
+    """
+    from app.services.document_processor import sync_pdf
+
+    try:
+        result = sync_pdf(file_path, lei_numero=lei_numero, tipo=tipo)
+        os.remove(file_path)
+        return {
+            "status": "Sucesso",
+            "message": (
+                f"Arquivo {os.path.basename(file_path)} sincronizado: "
+                f"{result['adicionados']} chunks adicionados, "
+                f"{result['removidos']} removidos, "
+                f"{result['inalterados']} inalterados."
+            ),
+        }
+    except Exception as e:
+        return {"status": "Erro", "message": str(e)}
@@ -49,3 +49,28 @@ def get_pdf_files(directory: str) -> List[str]:
         raise ValueError(f"Nenhum arquivo PDF encontrado no diretório '{directory}'.")
 
     return pdf_files
+
+
+def normalize_lei_numero(lei_numero: str) -> str:
+    """
+    Normaliza o número de uma lei ou decreto para o formato armazenado.
+
+    Os números são gravados sem pontuação (ex.: '8666'), mas costumam ser
+    escritos com separador de milhar (ex.: '8.666'). Esta função remove pontos
+    e espaços para que ambas as formas identifiquem o mesmo documento.
+
+    Args:
+        lei_numero (str): Número informado (ex.: '8.666', '8666', ' 10 024 ')
+
+    Returns:
+        str: Número apenas com dígitos (ex.: '8666')
+
+    Raises:
+        ValueError: Se o número contiver algo além de dígitos, pontos e espaços
+    """
+    normalized = lei_numero.replace(".", "").replace(" ", "")
+    if not normalized.isdigit():
+        raise ValueError(
+            f"Número de lei inválido: '{lei_numero}'. Use apenas dígitos (ex.: '8666' ou '8.666')."
+        )
+    return normalized
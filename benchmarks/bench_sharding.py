@@ -0,0 +1,154 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+import chromadb
+import numpy as np
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.services.sharding import route_shards  # noqa: E402
+from app.services.vector_store import ShardedChroma  # noqa: E402
+
+BASE_NAME = "bench"
+SHARD_KEY = "tipo_decada"
+TIPOS = ["lei", "decreto"]
+ANOS = list(range(1940, 2025))
+
+# Filtro no formato do ChromaDB e o predicado equivalente, usado no cálculo exato
+FILTERS = {
+    "sem filtro": (None, lambda m: True),
+    "tipo=lei": ({"tipo": {"$eq": "lei"}}, lambda m: m["tipo"] == "lei"),
+    "tipo=lei, 1990–1999": (
+        {"$and": [{"tipo": {"$eq": "lei"}}, {"ano": {"$gte": 1990}}, {"ano": {"$lte": 1999}}]},
+        lambda m: m["tipo"] == "lei" and 1990 <= m["ano"] <= 1999,
+    ),
+}
+
+
+def build_corpus(num_docs: int):
+    texts = [f"Art. {i}º Disposição sintética número {i}." for i in range(num_docs)]
+    metadatas = [{"tipo": random.choice(TIPOS), "ano": random.choice(ANOS)} for _ in texts]
+    return texts, metadatas
+
+
+def build_stores(client, embeddings, texts: list, metadatas: list, workers: int, batch_size: int = 1000):
+    """
+    Grava os mesmos chunks sintéticos em uma coleção única (Chroma) e nos
+    shards (ShardedChroma), pelo caminho de escrita usado pela aplicação.
+    """
+    mono = Chroma(client=client, collection_name=BASE_NAME, embedding_function=embeddings)
+    sharded = ShardedChroma(
+        embedding_function=embeddings,
+        client=client,
+        base_name=BASE_NAME,
+        shard_key=SHARD_KEY,
+        max_workers=workers,
+    )
+    for start in range(0, len(texts), batch_size):
+        end = start + batch_size
+        ids = [str(i) for i in range(start, min(end, len(texts)))]
+        mono.add_texts(texts[start:end], metadatas=metadatas[start:end], ids=ids)
+        sharded.add_texts(texts[start:end], metadatas=metadatas[start:end], ids=ids)
+    return mono, sharded
+
+
+def timed(fn, runs: int) -> list:
+    latencies = []
+    for run in range(runs):
+        start = time.perf_counter()
+        fn(run)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def recall(store, embeddings, texts: list, vectors, mask, queries: list, k: int, where) -> float:
+    """
+    Fração dos k vizinhos exatos (distância L2 calculada sobre todos os chunks
+    que satisfazem o filtro) retornados pela busca aproximada (HNSW).
+    """
+    candidates = np.flatnonzero(mask)
+    found = 0
+    for query in queries:
+        distances = np.linalg.norm(vectors[candidates] - embeddings.embed_query(query), axis=1)
+        exact = {texts[i] for i in candidates[np.argsort(distances)[:k]]}
+        results = store.similarity_search_with_score(query, k=k, filter=where)
+        found += len(exact & {doc.page_content for doc, _ in results})
+    return found / (k * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara a latência de busca entre uma coleção única e coleções particionadas."
+    )
+    parser.add_argument("--docs", type=int, default=20000, help="Número de chunks sintéticos.")
+    parser.add_argument("--dim", type=int, default=768, help="Dimensão dos embeddings.")
+    parser.add_argument("--runs", type=int, default=50, help="Consultas por cenário.")
+    parser.add_argument("--k", type=int, default=4, help="Resultados por consulta.")
+    parser.add_argument("--workers", type=int, default=8, help="Threads na busca distribuída.")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    random.seed(42)
+    embeddings = DeterministicFakeEmbedding(size=args.dim)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = chromadb.PersistentClient(path=tmp_dir)
+        print(f"Indexando {args.docs} chunks sintéticos (dim={args.dim})...")
+        texts, metadatas = build_corpus(args.docs)
+        mono, sharded = build_stores(client, embeddings, texts, metadatas, args.workers)
+        shard_names = sharded.list_shards()
+        print(f"{len(shard_names)} shards criados.\n")
+
+        queries = [f"consulta sobre licitações {i}" for i in range(args.runs)]
+        scenarios = [
+            (
+                "route_shards",
+                lambda run: route_shards(
+                    sharded.list_shards(), FILTERS["tipo=lei, 1990–1999"][0], BASE_NAME, SHARD_KEY
+                ),
+            ),
+            ("list_shards sem cache", lambda run: sharded.list_shards(refresh=True)),
+        ]
+        for label, (where, _) in FILTERS.items():
+            routed = route_shards(shard_names, where, BASE_NAME, SHARD_KEY)
+            for name, store in (("monolítica", mono), (f"shards ({len(routed)})", sharded)):
+                scenarios.append(
+                    (
+                        f"{name}, {label}",
+                        lambda run, store=store, where=where: store.similarity_search_with_score(
+                            queries[run], k=args.k, filter=where
+                        ),
+                    )
+                )
+
+        print(f"{'Cenário':<40}{'média (ms)':>12}{'p50 (ms)':>12}{'p95 (ms)':>12}")
+        for label, fn in scenarios:
+            fn(0)
+            latencies = sorted(timed(fn, args.runs))
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(
+                f"{label:<40}{statistics.mean(latencies):>12.3f}"
+                f"{statistics.median(latencies):>12.3f}{p95:>12.3f}"
+            )
+
+        vectors = np.array(embeddings.embed_documents(texts))
+        print(f"\n{'Recall@k (busca exata como referência)':<40}{'monolítica':>12}{'shards':>12}")
+        for label, (where, predicate) in FILTERS.items():
+            mask = np.array([predicate(m) for m in metadatas])
+            mono_recall, sharded_recall = (
+                recall(store, embeddings, texts, vectors, mask, queries, args.k, where)
+                for store in (mono, sharded)
+            )
+            print(f"{label:<40}{mono_recall:>12.0%}{sharded_recall:>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
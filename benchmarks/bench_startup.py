@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+BENCH_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["langchain", "langchain_community", "langchain_google_genai", "chromadb", "lark"]
+
+IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+SERVER_SNIPPET = """
+import sys
+import uvicorn
+from benchmarks.stubs import install_stubs_on_import
+install_stubs_on_import()
+from app.main import app
+
+uvicorn.run(app, port=int(sys.argv[1]), log_level="warning")
+"""
+
+SEND_TASK_SNIPPET = """
+import sys
+from benchmarks.celery_bench_app import celery_app
+from app.tasks import process_pdf_task
+print(process_pdf_task.delay(sys.argv[1]).id)
+"""
+
+
+def bench_env(project_root: str, **extra: str) -> dict:
+    """
+    Ambiente dos subprocessos: o projeto medido vem antes deste repositório no
+    PYTHONPATH, que fornece apenas o pacote benchmarks.
+    """
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join([project_root, BENCH_ROOT]),
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "benchmark"),
+        **extra,
+    }
+
+
+def measure_import(project_root: str, module: str) -> dict:
+    """
+    Mede, em um processo novo, o tempo de importação de um módulo e quais
+    dependências pesadas ele carrega.
+    """
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=project_root,
+        env=bench_env(project_root, WARMUP_ON_STARTUP="false"),
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_requests(project_root: str, warmup: bool, timeout: float = 120.0) -> dict:
+    """
+    Sobe o uvicorn e mede, a partir do início do processo, o tempo até a
+    primeira resposta de /api/health e até a primeira resposta de
+    /api/consultar-lei/, que carrega o serviço de consulta. Enquanto essa
+    primeira consulta está em andamento, /api/health é consultado em laço e a
+    maior latência observada é registrada: um endpoint que bloqueie o event
+    loop aparece aqui. Os modelos do Google são substituídos por modelos
+    falsos (benchmarks/stubs.py).
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}/api"
+    work_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-c", SERVER_SNIPPET, str(port)],
+        cwd=work_dir,
+        env=bench_env(project_root, WARMUP_ON_STARTUP=str(warmup).lower()),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"A API não respondeu em {timeout:.0f}s.")
+            try:
+                with urllib.request.urlopen(f"{base_url}/health", timeout=1) as response:
+                    if response.status == 200:
+                        health = time.perf_counter() - start
+                        break
+            except OSError:
+                time.sleep(0.01)
+
+        request = urllib.request.Request(
+            f"{base_url}/consultar-lei/",
+            data=json.dumps({"question": "Qual a lei de licitações?"}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        outcome = {}
+
+        def send_query():
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    outcome["status"] = response.status
+            except OSError as e:
+                outcome["error"] = e
+            outcome["elapsed"] = time.perf_counter() - start
+
+        query_thread = threading.Thread(target=send_query)
+        query_thread.start()
+        health_during_query = 0.0
+        while query_thread.is_alive():
+            request_start = time.perf_counter()
+            with urllib.request.urlopen(f"{base_url}/health", timeout=timeout):
+                pass
+            health_during_query = max(health_during_query, time.perf_counter() - request_start)
+            # Intervalo longo o bastante para não disputar a CPU com a consulta.
+            time.sleep(0.1)
+        query_thread.join()
+
+        if outcome.get("status") != 200:
+            raise RuntimeError(
+                f"/consultar-lei/ falhou: {outcome.get('error') or outcome.get('status')}."
+            )
+        return {
+            "health": health,
+            "consultar": outcome["elapsed"],
+            "health_durante_consulta": health_during_query,
+        }
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def create_sample_pdf(path: str) -> None:
+    import pymupdf  # type: ignore
+
+    document = pymupdf.open()
+    page = document.new_page()
+    page.insert_text(
+        (72, 72),
+        "LEI Nº 8.666, DE 21 DE JUNHO DE 1993\n"
+        "Art. 1º Esta Lei estabelece normas gerais sobre licitações e contratos.\n"
+        "Art. 2º As obras e serviços serão necessariamente precedidos de licitação.",
+    )
+    document.save(path)
+
+
+def measure_first_task(project_root: str, warmup: bool, timeout: float = 120.0) -> float:
+    """
+    Sobe um worker Celery (pool prefork, 1 processo filho) e mede, a partir do
+    início do worker, o tempo até o resultado da primeira process_pdf_task.
+    A tarefa é enfileirada antes de o worker subir, para que o custo do
+    processo que a envia não entre na medição. O broker e o backend de
+    resultados usam o sistema de arquivos (benchmarks/celery_bench_app.py),
+    dispensando o Redis.
+    """
+    work_dir = tempfile.mkdtemp()
+    celery_dir = os.path.join(work_dir, "celery")
+    env = bench_env(
+        project_root,
+        BENCH_CELERY_DIR=celery_dir,
+        WARMUP_ON_STARTUP=str(warmup).lower(),
+    )
+    pdf_path = os.path.join(work_dir, "lei_8666_1993.pdf")
+    create_sample_pdf(pdf_path)
+    task_id = subprocess.check_output(
+        [sys.executable, "-c", SEND_TASK_SNIPPET, pdf_path], cwd=work_dir, env=env
+    ).decode().strip().splitlines()[-1]
+    result_path = os.path.join(celery_dir, "results", f"celery-task-meta-{task_id}")
+
+    start = time.perf_counter()
+    worker = subprocess.Popen(
+        [
+            sys.executable, "-m", "celery",
+            "-A", "benchmarks.celery_bench_app:celery_app",
+            "worker", "--pool=prefork", "--concurrency=1", "--loglevel=warning",
+            "--without-gossip", "--without-mingle", "--without-heartbeat",
+        ],
+        cwd=work_dir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - start > timeout:
+                raise TimeoutError(f"A tarefa não terminou em {timeout:.0f}s.")
+            try:
+                with open(result_path, encoding="utf-8") as f:
+                    result = json.load(f)
+                break
+            except (OSError, ValueError):
+                time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        if result["status"] != "SUCCESS" or result["result"]["status"] != "Sucesso":
+            raise RuntimeError(f"A tarefa falhou: {result['result']}")
+        return elapsed
+    finally:
+        worker.terminate()
+        worker.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "media_s": round(statistics.mean(samples), 3),
+        "min_s": round(min(samples), 3),
+        "max_s": round(max(samples), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de importação e o tempo até a primeira requisição da API e do worker."
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Execuções por medição.")
+    parser.add_argument(
+        "--label", type=str, default="", help="Identificação da execução no arquivo de resultados."
+    )
+    parser.add_argument(
+        "--project-root",
+        type=str,
+        default=BENCH_ROOT,
+        help="Raiz do projeto a medir (ex.: um git worktree de outra versão).",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Arquivo JSON Lines onde o resultado será acrescentado.",
+    )
+    args = parser.parse_args()
+    project_root = os.path.abspath(args.project_root)
+
+    results = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "label": args.label}
+    for module in ["app.main", "app.tasks", "app.services.query_service"]:
+        samples = [measure_import(project_root, module) for _ in range(args.runs)]
+        results[f"import {module}"] = {
+            **summarize([s["seconds"] for s in samples]),
+            "heavy_modules": samples[-1]["heavy_modules"],
+        }
+
+    for warmup in (False, True):
+        suffix = "com aquecimento" if warmup else "sem aquecimento"
+        samples = [measure_first_requests(project_root, warmup) for _ in range(args.runs)]
+        results[f"primeira requisição /api/health ({suffix})"] = summarize(
+            [s["health"] for s in samples]
+        )
+        results[f"primeira requisição /api/consultar-lei/ ({suffix})"] = summarize(
+            [s["consultar"] for s in samples]
+        )
+        results[f"latência máxima de /api/health durante a primeira consulta ({suffix})"] = summarize(
+            [s["health_durante_consulta"] for s in samples]
+        )
+        results[f"primeira tarefa Celery ({suffix})"] = summarize(
+            [measure_first_task(project_root, warmup) for _ in range(args.runs)]
+        )
+
+    for name, value in results.items():
+        print(f"{name}: {value}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(results, ensure_ascii=False) + "\n")
+        print(f"Resultado acrescentado em '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Aplicação Celery usada por bench_startup.py.
+
+Reaproveita app.tasks, trocando o broker Redis pelo transporte em sistema de
+arquivos do kombu e instalando os modelos falsos antes de cada tarefa.
+"""
+
+import os
+
+from celery.signals import task_prerun  # type: ignore
+
+from app.tasks import celery_app
+
+BENCH_DIR = os.environ["BENCH_CELERY_DIR"]
+BROKER_DIR = os.path.join(BENCH_DIR, "broker")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+for directory in (BROKER_DIR, RESULTS_DIR):
+    os.makedirs(directory, exist_ok=True)
+
+celery_app.conf.update(
+    broker_url="filesystem://",
+    broker_transport_options={
+        "data_folder_in": BROKER_DIR,
+        "data_folder_out": BROKER_DIR,
+    },
+    result_backend=f"file://{RESULTS_DIR}",
+)
+
+
+@task_prerun.connect
+def install_benchmark_stubs(**kwargs):
+    from benchmarks.stubs import install_stubs
+
+    install_stubs()
@@ -0,0 +1,65 @@
+"""
+Substitutos locais para os modelos do Google usados nos benchmarks.
+
+Permitem exercitar o caminho real das requisições (imports, ChromaDB,
+self-query e cadeia de QA) sem chave de API e sem chamadas de rede.
+"""
+
+import importlib.abc
+import importlib.machinery
+import sys
+
+SELF_QUERY_RESPONSE = '```json\n{"query": "licitações", "filter": "NO_FILTER"}\n```'
+STUBBED_MODULES = ("app.services.vector_store", "app.services.query_service")
+
+
+def install_stubs() -> None:
+    """
+    Troca os modelos de embeddings e de chat do Google por modelos falsos.
+
+    Importa os módulos de serviço, portanto o custo desses imports é incluído
+    na medição de quem chama esta função.
+    """
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    from app.services import query_service, vector_store
+
+    vector_store.GoogleGenerativeAIEmbeddings = (
+        lambda **kwargs: DeterministicFakeEmbedding(size=768)
+    )
+    query_service.ChatGoogleGenerativeAI = lambda **kwargs: FakeListChatModel(
+        responses=[SELF_QUERY_RESPONSE, "Resposta simulada."]
+    )
+
+
+class _StubsLoader(importlib.abc.Loader):
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+        if all(name in sys.modules for name in STUBBED_MODULES):
+            install_stubs()
+
+
+class _StubsFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in STUBBED_MODULES:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is not None:
+            spec.loader = _StubsLoader(spec.loader)
+        return spec
+
+
+def install_stubs_on_import() -> None:
+    """
+    Instala os modelos falsos somente quando a aplicação importar os módulos
+    de serviço, sem antecipar esses imports. Assim o custo e o local (event
+    loop ou threadpool) do primeiro import continuam sendo os da aplicação.
+    """
+    sys.meta_path.insert(0, _StubsFinder())
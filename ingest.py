@@ -4,12 +4,51 @@ import sys
 
 from tqdm import tqdm  # type: ignore
 
-from app.processing import process_pdf_and_store
+from app.services.document_processor import (
+    delete_document,
+    list_sources,
+    process_pdf_and_store,
+    sync_pdf,
+)
+from app.services.vector_store import migrate_monolithic_collection
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
 
+def sync_folder(pdf_files: list) -> None:
+    """
+    Reconcilia os PDFs de uma pasta com os documentos armazenados no ChromaDB.
+
+    Cada PDF é sincronizado pelo nome do arquivo (apenas chunks alterados são
+    gravados) e os documentos armazenados cujo arquivo não está mais na pasta
+    são removidos.
+
+    Args:
+        pdf_files (list): Caminhos dos PDFs presentes na pasta
+    """
+    totals = {"adicionados": 0, "removidos": 0, "inalterados": 0}
+    for pdf_file in tqdm(pdf_files, desc="Sincronizando PDFs"):
+        try:
+            result = sync_pdf(pdf_file)
+            for key in totals:
+                totals[key] += result[key]
+        except Exception as e:
+            print(f"Erro ao sincronizar o arquivo {os.path.basename(pdf_file)}: {e}")
+            continue
+
+    folder_sources = {os.path.basename(f) for f in pdf_files}
+    obsolete_sources = sorted(list_sources() - folder_sources)
+    for source in obsolete_sources:
+        totals["removidos"] += delete_document(source=source)
+
+    print(
+        f"\nSincronização concluída: {totals['adicionados']} chunks adicionados, "
+        f"{totals['removidos']} removidos, {totals['inalterados']} inalterados, "
+        f"{len(obsolete_sources)} documentos removidos."
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Processa todos os arquivos PDF em uma pasta e os adiciona ao ChromaDB."
@@ -17,9 +56,34 @@ def main():
     parser.add_argument(
         "folder_path",
         type=str,
+        nargs="?",
         help="Caminho para a pasta contendo os PDFs a serem processados.",
     )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=(
+            "Reconcilia a pasta com o ChromaDB: grava apenas chunks novos ou alterados "
+            "e remove documentos que não estão mais na pasta."
+        ),
+    )
+    parser.add_argument(
+        "--reshard",
+        action="store_true",
+        help=(
+            "Move os chunks da coleção única 'leis_decretos' para os shards "
+            "definidos por CHROMA_SHARD_KEY, reaproveitando os embeddings."
+        ),
+    )
     args = parser.parse_args()
+
+    if args.reshard:
+        migrate_monolithic_collection()
+        if not args.folder_path:
+            return
+    elif not args.folder_path:
+        parser.error("Informe o caminho da pasta ou use --reshard.")
+
     target_folder = args.folder_path
 
     if not os.path.isdir(target_folder):
@@ -38,6 +102,10 @@ def main():
 
     print(f"Encontrados {len(pdf_files_to_process)} arquivos PDF para processar.")
 
+    if args.sync:
+        sync_folder(pdf_files_to_process)
+        return
+
     for pdf_file in tqdm(pdf_files_to_process, desc="Processando PDFs"):
         try:
             print(f"\nIniciando processamento de: {os.path.basename(pdf_file)}")